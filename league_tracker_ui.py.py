@@ -1,14 +1,43 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog, simpledialog
+from tkinter import messagebox, ttk
 import json
-import csv
-import datetime
-import platform
-import subprocess
+import functools
+from collections import namedtuple
+import time
+from operator import itemgetter
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
 
+_PLACEMENT_POINTS = {
+    "1st": 5,
+    "2nd": 3,
+    "3rd": 2,
+    "4th": 1,
+    "5th+": 0,
+    "Did Not Play": None
+}
+
+_NEW_PLAYER_STATS = {"points": 0, "games_played": 0, "mvp_count": 0}
+
+_PLACEMENT_OPTIONS = ("1st", "2nd", "3rd", "4th", "5th+", "Did Not Play")
+
+_RecordRow = namedtuple("_RecordRow", ["swatch", "name_label", "placement_menu", "deck_entry", "var", "deck_var"])
+
+_TEAM_COLORS = ("red", "blue", "green", "orange", "purple", "magenta", "cyan", "yellow", "pink")
+
+
+@functools.lru_cache(maxsize=1)
 def is_dark_mode_mac():
+    import platform
     if platform.system() == "Darwin":
+        import subprocess
         try:
             result = subprocess.run(
                 ["defaults", "read", "-g", "AppleInterfaceStyle"],
@@ -22,98 +51,132 @@ def is_dark_mode_mac():
     return False
 
 
+def _format_game(game):
+    parts = [f"{game['timestamp']}:\n"]
+    for player, result in game["results"].items():
+        parts.append(f"  {player}: {result}\n")
+    if game["notes"]:
+        parts.append(f"  Notes: {game['notes']}\n")
+    if game.get("mvp"):
+        parts.append(f"  MVP: {game['mvp']}\n")
+    if game.get("decks_used"):
+        for player, deck in game["decks_used"].items():
+            if deck:
+                parts.append(f"  {player}'s Deck: {deck}\n")
+    elif game.get("deck_used"):
+        parts.append(f"  Deck Used: {game['deck_used']}\n")
+    return "".join(parts)
+
+
 class CommanderLeague:
     def __init__(self, players=None):
         if players is None:
             players = []
-        team_colors = ["red", "blue", "green", "orange", "purple", "magenta", "cyan", "yellow", "pink"]
-        self.players = {
-            player: {"points": 0, "games_played": 0, "mvp_count": 0, "color": team_colors[i % len(team_colors)]}
-            for i, player in enumerate(players)
-        }
+        self.players = {}
+        for i, player in enumerate(players):
+            stats = _NEW_PLAYER_STATS.copy()
+            stats["color"] = _TEAM_COLORS[i % len(_TEAM_COLORS)]
+            self.players[player] = stats
         self.history = []
+        self.history_strs = []
+        self.version = 0
+        self._standings_cache = {}
 
     def record_game_results(self, results_dict, notes="", mvp="", decks_used=None):
         if decks_used is None:
             decks_used = {}
-
-        placement_points = {
-            "1st": 5,
-            "2nd": 3,
-            "3rd": 2,
-            "4th": 1,
-            "5th+": 0
-        }
+        self.version += 1
 
         game = {
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "results": results_dict,
             "notes": notes,
             "mvp": mvp,
             "decks_used": decks_used
         }
         self.history.append(game)
+        if self.history_strs is not None:
+            self.history_strs.append(_format_game(game))
 
+        get_points = _PLACEMENT_POINTS.get
+        players = self.players
         for player, place in results_dict.items():
-            if place == "Did Not Play":
+            points = get_points(place, 0)
+            if points is None:
                 continue
-            points = placement_points.get(place, 0)
-            self.players[player]["points"] += points
-            self.players[player]["games_played"] += 1
+            stats = players[player]
+            stats["points"] += points
+            stats["games_played"] += 1
 
         if mvp and mvp in self.players:
             self.players[mvp]["points"] += 1
             self.players[mvp]["mvp_count"] += 1
 
     def get_standings(self, sort_by='average'):
-        standings = []
-        for player, data in self.players.items():
-            points = data["points"]
-            games = data["games_played"]
-            mvp_count = data.get("mvp_count", 0)
-            avg = (points / games) if games > 0 else 0
-            standings.append((player, points, games, avg, mvp_count))
+        cached = self._standings_cache.get(sort_by)
+        if cached is not None and cached[0] == self.version:
+            return list(cached[1])
+
+        standings = [
+            (player, data["points"], data["games_played"],
+             (data["points"] / data["games_played"]) if data["games_played"] > 0 else 0,
+             data.get("mvp_count", 0))
+            for player, data in self.players.items()
+        ]
         if sort_by == 'games':
-            return sorted(standings, key=lambda x: x[2], reverse=True)
-        return sorted(standings, key=lambda x: x[3], reverse=True)
+            standings.sort(key=itemgetter(2), reverse=True)
+        else:
+            standings.sort(key=itemgetter(3), reverse=True)
+        self._standings_cache[sort_by] = (self.version, standings)
+        return list(standings)
 
     def save_to_file(self, filename='league_scores.json'):
         data = {"players": self.players, "history": self.history}
-        with open(filename, 'w') as f:
-            json.dump(data, f)
+        payload = _json_dumps(data)
+        with open(filename, 'wb') as f:
+            f.write(payload)
 
     def load_from_file(self, filename='league_scores.json'):
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                self.players = data.get("players", {})
-                self.history = data.get("history", [])
+            with open(filename, 'rb') as f:
+                data = _json_loads(f.read())
+            self.players = data.get("players", {})
+            self.history = data.get("history", [])
+            self.history_strs = None
+            self.version += 1
         except FileNotFoundError:
             print("Save file not found. Starting new league.")
 
     def export_to_csv(self, filename='league_export.csv'):
+        import csv
         with open(filename, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(["Player", "Points", "Games Played", "Average Points per Game", "MVP Awards"])
-            for player, points, games, avg, mvps in self.get_standings():
-                writer.writerow([player, points, games, f"{avg:.2f}", mvps])
+            writer.writerows(
+                [player, points, games, f"{avg:.2f}", mvps]
+                for player, points, games, avg, mvps in self.get_standings()
+            )
 
     def add_player(self, name):
         if name and name not in self.players:
-            team_colors = ["red", "blue", "green", "orange", "purple", "magenta", "cyan", "yellow", "pink"]
-            color = team_colors[len(self.players) % len(team_colors)]
-            self.players[name] = {"points": 0, "games_played": 0, "mvp_count": 0, "color": color}
+            stats = _NEW_PLAYER_STATS.copy()
+            stats["color"] = _TEAM_COLORS[len(self.players) % len(_TEAM_COLORS)]
+            self.players[name] = stats
+            self.version += 1
 
     def remove_player(self, name):
         if name in self.players:
             del self.players[name]
+            self.version += 1
 
     def reset_league(self):
-        for player in self.players:
-            self.players[player]["points"] = 0
-            self.players[player]["games_played"] = 0
-            self.players[player]["mvp_count"] = 0
+        for stats in self.players.values():
+            stats["points"] = 0
+            stats["games_played"] = 0
+            stats["mvp_count"] = 0
         self.history = []
+        self.history_strs = []
+        self.version += 1
 
 
 class LeagueApp:
@@ -121,6 +184,8 @@ class LeagueApp:
         self.root = root
         self.league = league
         self.sort_mode = 'average'
+        self._record_dialog = None
+        self._standings_messages = {}
         self.dark_mode = is_dark_mode_mac()
         self.bg_color = "#1e1e1e" if self.dark_mode else "white"
         self.fg_color = "white" if self.dark_mode else "black"
@@ -131,9 +196,6 @@ class LeagueApp:
         self.build_main_ui()
 
     def build_main_ui(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
         main_frame = tk.Frame(self.root, padx=10, pady=10, bg=self.bg_color)
         main_frame.pack()
 
@@ -155,13 +217,20 @@ class LeagueApp:
                       bg=self.btn_bg, fg=self.btn_fg).grid(row=i // 3, column=i % 3, padx=5, pady=5)
 
     def open_record_game_dialog(self):
+        if self._record_dialog is None or not self._record_dialog.winfo_exists():
+            self._build_record_dialog()
+            self._sync_record_rows()
+            self._reset_record_fields()
+        elif self._record_dialog.state() == "withdrawn":
+            self._reset_record_fields()
+        self._record_dialog.deiconify()
+        self._record_dialog.lift()
+
+    def _build_record_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Record Game Result")
         dialog.configure(bg=self.bg_color)
-
-        placement_options = ["1st", "2nd", "3rd", "4th", "5th+", "Did Not Play"]
-        entries = {}
-        deck_entries = {}
+        dialog.protocol("WM_DELETE_WINDOW", dialog.withdraw)
 
         player_frame = tk.Frame(dialog, bg=self.bg_color)
         player_frame.pack(fill="both", expand=True)
@@ -177,22 +246,6 @@ class LeagueApp:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        for player in self.league.players:
-            row = tk.Frame(scrollable, bg=self.bg_color)
-            row.pack(anchor="w", fill="x", pady=2)
-
-            color = self.league.players[player].get("color", "gray")
-            tk.Label(row, bg=color, width=2).pack(side="left", padx=(5, 5))
-            tk.Label(row, text=player, bg=self.bg_color, fg=self.fg_color, width=15, anchor="w").pack(side="left")
-
-            var = tk.StringVar(value="Did Not Play")
-            tk.OptionMenu(row, var, *placement_options).pack(side="left", padx=5)
-            entries[player] = var
-
-            deck_var = tk.StringVar()
-            tk.Entry(row, textvariable=deck_var, width=20).pack(side="left", padx=(5, 5))
-            deck_entries[player] = deck_var
-
         form = tk.Frame(dialog, bg=self.bg_color, padx=10, pady=10)
         form.pack(fill="x")
 
@@ -202,57 +255,124 @@ class LeagueApp:
 
         tk.Label(form, text="MVP:", bg=self.bg_color, fg=self.fg_color).pack(anchor="w")
         mvp_var = tk.StringVar()
-        mvp_choices = list(self.league.players.keys())
-        if mvp_choices:
-            mvp_var.set(mvp_choices[0])
-        tk.OptionMenu(form, mvp_var, *mvp_choices).pack(anchor="w", pady=(0, 10))
-
-        def record():
-            results = {p: var.get() for p, var in entries.items()}
-            if all(r == "Did Not Play" for r in results.values()):
-                messagebox.showerror("Error", "At least one player must have a placement.")
-                return
-
-            decks_used = {p: deck_entries[p].get().strip() for p in entries}
-
-            self.league.record_game_results(
-                results,
-                notes=notes_entry.get().strip(),
-                mvp=mvp_var.get().strip(),
-                decks_used=decks_used
-            )
-            messagebox.showinfo("Success", "Game result recorded.")
-            dialog.destroy()
+        mvp_menu = tk.OptionMenu(form, mvp_var, "")
+        mvp_menu.pack(anchor="w", pady=(0, 10))
+
+        tk.Button(form, text="Record Game", command=self._record_game,
+                  bg=self.btn_bg, fg=self.btn_fg).pack(pady=5)
+
+        self._record_dialog = dialog
+        self._record_scrollable = scrollable
+        self._record_rows = {}
+        self._record_row_index = {}
+        self._record_notes_entry = notes_entry
+        self._record_mvp_var = mvp_var
+        self._record_mvp_menu = mvp_menu
+
+    def _build_record_row(self, player, color):
+        scrollable = self._record_scrollable
+        var = tk.StringVar(value="Did Not Play")
+        deck_var = tk.StringVar()
+        return _RecordRow(
+            swatch=tk.Label(scrollable, bg=color, width=2),
+            name_label=tk.Label(scrollable, text=player, bg=self.bg_color, fg=self.fg_color, width=15, anchor="w"),
+            placement_menu=ttk.Combobox(scrollable, textvariable=var, values=_PLACEMENT_OPTIONS,
+                                        state="readonly", width=12),
+            deck_entry=tk.Entry(scrollable, textvariable=deck_var, width=20),
+            var=var,
+            deck_var=deck_var
+        )
+
+    def _grid_record_row(self, row, index):
+        row.swatch.grid(row=index, column=0, padx=(5, 5), pady=2)
+        row.name_label.grid(row=index, column=1, sticky="w", pady=2)
+        row.placement_menu.grid(row=index, column=2, sticky="w", padx=5, pady=2)
+        row.deck_entry.grid(row=index, column=3, padx=(5, 5), pady=2)
+
+    def _sync_record_dialog(self):
+        if self._record_dialog is not None and self._record_dialog.winfo_exists():
+            self._sync_record_rows()
+
+    def _sync_record_rows(self):
+        snapshot = tuple((name, data.get("color", "gray")) for name, data in self.league.players.items())
+        names = [name for name, _ in snapshot]
+        rows = self._record_rows
+        row_index = self._record_row_index
+
+        current = set(names)
+        for player in [p for p in rows if p not in current]:
+            row = rows.pop(player)
+            row_index.pop(player, None)
+            for widget in (row.swatch, row.name_label, row.placement_menu, row.deck_entry):
+                widget.destroy()
+
+        for player, color in snapshot:
+            row = rows.get(player)
+            if row is None:
+                rows[player] = self._build_record_row(player, color)
+            else:
+                row.swatch.configure(bg=color)
+
+        self._record_rows = rows = {p: rows[p] for p in names}
+        for index, (player, row) in enumerate(rows.items()):
+            if row_index.get(player) != index:
+                self._grid_record_row(row, index)
+                row_index[player] = index
+
+        mvp_var = self._record_mvp_var
+        menu = self._record_mvp_menu["menu"]
+        menu.delete(0, "end")
+        for player in names:
+            menu.add_command(label=player, command=tk._setit(mvp_var, player))
+        if mvp_var.get() not in current:
+            mvp_var.set(names[0] if names else "")
+
+    def _reset_record_fields(self):
+        for row in self._record_rows.values():
+            row.var.set("Did Not Play")
+            row.deck_var.set("")
+        self._record_notes_entry.delete(0, "end")
+        self._record_mvp_var.set(next(iter(self._record_rows), ""))
+
+    def _record_game(self):
+        rows = self._record_rows
+        results = {p: row.var.get() for p, row in rows.items()}
+        if set(results.values()) <= {"Did Not Play"}:
+            messagebox.showerror("Error", "At least one player must have a placement.")
+            return
 
-        tk.Button(form, text="Record Game", command=record, bg=self.btn_bg, fg=self.btn_fg).pack(pady=5)
+        decks_used = {p: row.deck_var.get().strip() for p, row in rows.items()}
+
+        self.league.record_game_results(
+            results,
+            notes=self._record_notes_entry.get().strip(),
+            mvp=self._record_mvp_var.get().strip(),
+            decks_used=decks_used
+        )
+        messagebox.showinfo("Success", "Game result recorded.")
+        self._record_dialog.withdraw()
 
     def show_standings(self):
-        standings = self.league.get_standings(sort_by=self.sort_mode)
-        message = f"Standings (sorted by {self.sort_mode}):\n\n"
-        for i, (player, points, games, avg, mvps) in enumerate(standings, 1):
-            message += f"{i}. {player}: {points} pts | {games} games | {avg:.2f} avg | {mvps} MVPs\n"
+        version = self.league.version
+        cached = self._standings_messages.get(self.sort_mode)
+        if cached is not None and cached[0] == version:
+            message = cached[1]
+        else:
+            standings = self.league.get_standings(sort_by=self.sort_mode)
+            parts = [f"Standings (sorted by {self.sort_mode}):\n\n"]
+            for i, (player, points, games, avg, mvps) in enumerate(standings, 1):
+                parts.append(f"{i}. {player}: {points} pts | {games} games | {avg:.2f} avg | {mvps} MVPs\n")
+            message = "".join(parts)
+            self._standings_messages[self.sort_mode] = (version, message)
         messagebox.showinfo("League Standings", message)
 
     def show_history(self):
         if not self.league.history:
             messagebox.showinfo("History", "No games recorded yet.")
             return
-        message = "Game History:\n\n"
-        for game in self.league.history:
-            message += f"{game['timestamp']}:\n"
-            for player, result in game["results"].items():
-                message += f"  {player}: {result}\n"
-            if game["notes"]:
-                message += f"  Notes: {game['notes']}\n"
-            if game.get("mvp"):
-                message += f"  MVP: {game['mvp']}\n"
-            if game.get("decks_used"):
-                for player, deck in game["decks_used"].items():
-                    if deck:
-                        message += f"  {player}'s Deck: {deck}\n"
-            elif game.get("deck_used"):
-                message += f"  Deck Used: {game['deck_used']}\n"
-            message += "\n"
+        if self.league.history_strs is None:
+            self.league.history_strs = [_format_game(game) for game in self.league.history]
+        message = "Game History:\n\n" + "\n".join(self.league.history_strs) + "\n"
         messagebox.showinfo("Game History", message)
 
     def save_league(self):
@@ -261,10 +381,11 @@ class LeagueApp:
 
     def load_league(self):
         self.league.load_from_file()
-        self.build_main_ui()
+        self._sync_record_dialog()
         self.show_standings()
 
     def export_csv(self):
+        from tkinter import filedialog
         file = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
         if file:
             self.league.export_to_csv(file)
@@ -287,24 +408,25 @@ class LeagueApp:
             name = name_entry.get().strip()
             if name:
                 self.league.add_player(name)
-                self.build_main_ui()
+                self._sync_record_dialog()
             dialog.destroy()
 
         tk.Button(dialog, text="Add", command=confirm,
                   bg=self.btn_bg, fg=self.btn_fg).pack(pady=10)
 
     def remove_player(self):
+        from tkinter import simpledialog
         name = simpledialog.askstring("Remove Player", "Enter player name to remove:")
         if name and name in self.league.players:
             self.league.remove_player(name.strip())
-            self.build_main_ui()
+            self._sync_record_dialog()
         else:
             messagebox.showerror("Error", f"Player '{name}' not found.")
 
     def reset_league(self):
         if messagebox.askyesno("Reset League", "Are you sure you want to reset all scores and history?"):
             self.league.reset_league()
-            self.build_main_ui()
+            self._sync_record_dialog()
             messagebox.showinfo("Reset", "League has been reset.")
 
 